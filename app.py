@@ -1,36 +1,97 @@
-# --- Make sure to run this cell first: !pip install dash dash-bootstrap-components gunicorn pandas scikit-learn ---
+# --- Make sure to run this cell first: !pip install dash dash-bootstrap-components gunicorn orjson pandas pyarrow scikit-learn ---
 
+from functools import lru_cache
 from dash import Dash, dcc, html, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
+import plotly.io as pio
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
+
+from country_codes import COUNTRY_ISO3
 
 # --- 1. Initialize the Dash App with a modern theme ---
 app = Dash(__name__, external_stylesheets=[dbc.themes.FLATLY])
 server = app.server
 app.title = "Global Mineral Dashboard"
 
+# Dash encodes callback responses through plotly's JSON encoder, so this switches both to orjson
+pio.json.config.default_engine = 'orjson'
+
 # --- 2. Load Data and Define Layout ---
 try:
-    df = pd.read_csv('final 1.csv')
+    # Typed, columnar copy of 'final 1.csv' written by convert_data.py
+    df = pd.read_parquet('mineral.parquet', engine='pyarrow', memory_map=True)
 
     # --- Data Cleaning and Preparation ---
-    df['Year'] = pd.to_numeric(df['Year'], errors='coerce').dropna().astype(int)
+    # Drop rows without a usable year rather than assigning a shorter Series back into the frame
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
+    df = df[df['Year'].notna()].copy()
+
+    # Shrink the frame once: a small int for the year, categories for repeated labels.
+    # Quantities stay 64-bit; country totals exceed float32's exact integer range.
+    df['Year'] = df['Year'].astype('int16')
+    df[['Country', 'Production Mineral', 'Import Mineral Name']] = df[['Country', 'Production Mineral', 'Import Mineral Name']].astype('category')
     years = sorted(df['Year'].unique())
+
+    # Every country must have an ISO-3 code, otherwise it silently drops off the maps
+    missing_iso3 = sorted(set(df['Country'].cat.categories) - set(COUNTRY_ISO3))
+    if missing_iso3:
+        raise ValueError(f"No ISO-3 code in country_codes.py for: {', '.join(missing_iso3)}")
+
+    # Keep each year's rows contiguous so a year's data is a positional slice, not a full-frame mask
+    df = df.sort_values('Year', kind='stable', ignore_index=True)
+    year_slices = {year: slice(df['Year'].searchsorted(year, 'left'), df['Year'].searchsorted(year, 'right')) for year in years}
     home_country = "India"
+    home_iso3 = COUNTRY_ISO3[home_country]
     home_country_color = '#20c997'
     unit = "(tonnes)"
 
-    # Get unique lists for dropdowns
-    prod_minerals = sorted(df['Production Mineral'].dropna().unique())
-    import_minerals = sorted(df['Import Mineral Name'].dropna().unique())
+    # Get unique lists for dropdowns (categories are already sorted and NaN-free)
+    prod_minerals = df['Production Mineral'].cat.categories.tolist()
+    import_minerals = df['Import Mineral Name'].cat.categories.tolist()
     all_minerals = sorted(list(set(prod_minerals + import_minerals)))
     all_minerals_with_total = ["--- All Minerals ---"] + all_minerals
 
     # Identify numeric columns for indicators
     known_cols = ['Country', 'Year', 'Production Mineral', 'Production Qty', 'Import Mineral Name', 'Import Qty']
-    indicator_cols = sorted([col for col in df.columns if df[col].dtype in ['int64', 'float64'] and col not in known_cols and col != 'Year'])
+    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
+    indicator_cols = sorted(set(numeric_cols) - set(known_cols))
+
+    # Slider marks and dropdown options, built once
+    YEAR_MARKS = {str(year): str(year) for year in years}
+    MINERAL_OPTS = [{'label': m, 'value': m} for m in all_minerals_with_total]
+    ANALYSIS_MINERAL_OPTS = [{'label': m, 'value': m} for m in all_minerals]
+    INDICATOR_OPTS = [{'label': i, 'value': i} for i in indicator_cols]
+
+    # Pre-compute per-country totals once so the callbacks only do lookups
+    PROD = df.groupby(['Year', 'Production Mineral', 'Country'], observed=True)['Production Qty'].sum()
+    IMP = df.groupby(['Year', 'Import Mineral Name', 'Country'], observed=True)['Import Qty'].sum()
+    PROD_ALL = df.groupby(['Year', 'Country'], observed=True)['Production Qty'].sum()
+    IMP_ALL = df.groupby(['Year', 'Country'], observed=True)['Import Qty'].sum()
+
+    # Shared look of the overview map, used by both the Python figures and the client-side indicator view
+    MAP_TRACE = dict(locationmode="ISO-3", colorscale="YlOrRd", name='')
+    HOME_TRACE = dict(locations=[home_iso3], z=[1], locationmode="ISO-3", colorscale=[[0, home_country_color], [1, home_country_color]], showscale=False, hoverinfo='skip')
+    MAP_LAYOUT = dict(geo=dict(showframe=False, showcoastlines=False, projection_type='natural earth', bgcolor='rgba(0,0,0,0)', landcolor='#E5ECF6'), margin=dict(t=10, b=10, l=10, r=10))
+
+    # Indicator maps are drawn in the browser from per-year tables (one row per country) shipped with the page
+    INDICATOR_TABLES = {
+        str(year): {
+            'locations': rows['Country'].map(COUNTRY_ISO3).astype(str).tolist(),
+            'countries': rows['Country'].astype(str).tolist(),
+            'values': {col: rows[col].astype(object).where(rows[col].notna(), None).tolist() for col in indicator_cols},
+        }
+        for year, rows in df.drop_duplicates(['Year', 'Country']).groupby('Year')
+    }
+    INDICATOR_STORE = {
+        'tables': INDICATOR_TABLES,
+        'trace': go.Choropleth(**MAP_TRACE).to_plotly_json(),
+        'home_trace': go.Choropleth(**HOME_TRACE).to_plotly_json(),
+        'home_iso3': home_iso3,
+        'home_color': home_country_color,
+        'layout': go.Figure(layout=MAP_LAYOUT).to_dict()['layout'],
+    }
 
     # --- Define the Main App Layout with Tabs ---
     app.layout = dbc.Container(fluid=True, children=[
@@ -47,13 +108,14 @@ try:
                 dbc.Card(
                     dbc.CardBody([
                         dbc.Row([
-                            dbc.Col(dcc.Dropdown(id='mineral-dropdown', options=[{'label': m, 'value': m} for m in all_minerals_with_total], value='--- All Minerals ---'), width=12, md=4),
+                            dbc.Col(dcc.Dropdown(id='mineral-dropdown', options=MINERAL_OPTS, value='--- All Minerals ---'), width=12, md=4),
                             dbc.Col(dcc.Dropdown(id='data-type-dropdown', options=[{'label': 'Production', 'value': 'Production'}, {'label': 'Import', 'value': 'Import'}, {'label': 'Production & Import', 'value': 'Combined'}], value='Combined'), width=12, md=4),
-                            dbc.Col(dcc.Dropdown(id='indicator-dropdown', options=[{'label': i, 'value': i} for i in indicator_cols], value=None, placeholder="View an economic indicator..."), width=12, md=4),
+                            dbc.Col(dcc.Dropdown(id='indicator-dropdown', options=INDICATOR_OPTS, value=None, placeholder="View an economic indicator..."), width=12, md=4),
                         ], className="g-3")
                     ]), className="mt-4 mb-4 shadow-sm"
                 ),
                 dcc.Graph(id='world-map', style={'height': '65vh'}),
+                dcc.Store(id='indicator-store', data=INDICATOR_STORE, storage_type='memory'),
             ]),
             # Analysis Tab
             dcc.Tab(label='Analysis', value='tab-analysis', children=[
@@ -62,7 +124,7 @@ try:
                         dbc.Row([
                             dbc.Col([
                                 html.Label('Select Mineral to Analyze', className='fw-bold'),
-                                dcc.Dropdown(id='analysis-mineral-dropdown', options=[{'label': m, 'value': m} for m in all_minerals], placeholder="Select a mineral...")
+                                dcc.Dropdown(id='analysis-mineral-dropdown', options=ANALYSIS_MINERAL_OPTS, placeholder="Select a mineral...")
                             ], width=12, md=8),
                             dbc.Col(dbc.Button("Run Analysis", id="run-analysis-button", color="primary", className="w-100 mt-4"), width=12, md=4),
                         ], className="g-3 align-items-end")
@@ -78,18 +140,61 @@ try:
         # Shared Year Slider
         html.Div([
             html.Label('Select Year', className='fw-bold mb-2'),
-            dcc.Slider(id='year-slider', min=min(years), max=max(years), value=max(years), marks={str(year): str(year) for year in years}, step=None)
+            dcc.Slider(id='year-slider', min=min(years), max=max(years), value=max(years), marks=YEAR_MARKS, step=None, updatemode='mouseup')
         ], className="p-4")
     ])
 
 except FileNotFoundError:
     app.layout = dbc.Container([
         html.H1("Error: Data File Not Found", className="text-danger"),
-        html.P("'final 1.csv' was not found. Please ensure it's in the same directory.")
+        html.P("'mineral.parquet' was not found. Run convert_data.py next to 'final 1.csv' to create it.")
     ], className="p-5 mt-5 bg-light border rounded")
 
 # --- 4. Define Callbacks ---
 if 'df' in locals():
+    def country_totals(totals, key):
+        # Country-indexed slice of a pre-computed total, empty if the key has no rows
+        if key in totals.index:
+            return totals.loc[key]
+        return pd.Series(dtype=totals.dtype, index=pd.Index([], name='Country'), name=totals.name)
+
+    # All three data-type views for a (year, mineral), computed in one pass and shared by every data type; callers must not mutate it
+    @lru_cache(maxsize=256)
+    def trade_views(selected_year, selected_mineral):
+        prod = country_totals(PROD_ALL, selected_year) if selected_mineral == "--- All Minerals ---" else country_totals(PROD, (selected_year, selected_mineral))
+        imp = country_totals(IMP_ALL, selected_year) if selected_mineral == "--- All Minerals ---" else country_totals(IMP, (selected_year, selected_mineral))
+        prod, imp = prod.align(imp, join='outer', fill_value=0)
+        return pd.DataFrame({'Production': prod, 'Import': imp, 'Combined': prod + imp})
+
+    # Overview figures are cached per input combination; a plain dict is returned since Figures are mutable
+    @lru_cache(maxsize=512)
+    def build_overview_fig(selected_year, selected_mineral, data_type):
+        fig = go.Figure()
+
+        views = trade_views(selected_year, selected_mineral)
+        display = views[views[data_type] > 0]
+        z_data = display[data_type]
+
+        if data_type == 'Combined':
+            # Pre-format the hover labels here rather than shipping both quantities for the browser to format
+            hover_text = ('<b>' + display.index.astype(str) + '</b><br>Production: ' + display['Production'].map('{:,.0f}'.format).astype(str).values
+                          + '<br>Import: ' + display['Import'].map('{:,.0f}'.format).astype(str).values)
+            hover_template = '%{text}<extra></extra>'
+        else:
+            hover_text, hover_template = display.index, f'<b>%{{text}}</b><br>{data_type}: %{{z:,.0f}} {unit}<extra></extra>'
+
+        # Outline the home country inside the data trace; a separate highlight trace is only needed when it has no data
+        # ISO-3 codes are a direct lookup in plotly.js, unlike its country-name matching
+        locations = np.asarray(display.index.map(COUNTRY_ISO3))
+        is_home = locations == home_iso3
+        if len(locations):
+            fig.add_trace(go.Choropleth(locations=locations, z=z_data, text=hover_text, colorbar_title=f'Quantity {unit}', hovertemplate=hover_template, **MAP_TRACE,
+                                        marker_line_color=np.where(is_home, home_country_color, '#444'), marker_line_width=np.where(is_home, 3, 1)))
+        if not is_home.any():
+            fig.add_trace(go.Choropleth(**HOME_TRACE))
+        fig.update_layout(**MAP_LAYOUT)
+        return fig.to_dict()
+
     # Callback for the Overview Tab
     @app.callback(
         Output('world-map', 'figure'),
@@ -99,41 +204,52 @@ if 'df' in locals():
          Input('indicator-dropdown', 'value')]
     )
     def update_overview_map(selected_year, selected_mineral, data_type, indicator):
-        year_df = df[df['Year'] == selected_year].copy()
-        fig = go.Figure()
-        
-        locations = pd.Series(dtype='str')
-        z_data, custom_data, hover_template, colorbar_title = None, None, '', ''
-
+        # Indicator maps are drawn by the client-side callback below
         if indicator:
-            map_data = year_df[['Country', indicator]].dropna()
-            z_data, locations = map_data[indicator], map_data['Country']
-            hover_template, colorbar_title = f'<b>%{{location}}</b><br>{indicator}: %{{z:,.2f}}<extra></extra>', indicator
-        else:
-            prod_df = year_df.groupby('Country')['Production Qty'].sum().reset_index() if selected_mineral == "--- All Minerals ---" else year_df[year_df['Production Mineral'] == selected_mineral].groupby('Country')['Production Qty'].sum().reset_index()
-            import_df = year_df.groupby('Country')['Import Qty'].sum().reset_index() if selected_mineral == "--- All Minerals ---" else year_df[year_df['Import Mineral Name'] == selected_mineral].groupby('Country')['Import Qty'].sum().reset_index()
-            merged_df = pd.merge(prod_df, import_df, on='Country', how='outer').fillna(0)
-
-            if data_type == 'Production':
-                display_df = merged_df[merged_df['Production Qty'] > 0]
-                z_data, hover_template = display_df['Production Qty'], f'<b>%{{location}}</b><br>Production: %{{z:,.0f}} {unit}<extra></extra>'
-            elif data_type == 'Import':
-                display_df = merged_df[merged_df['Import Qty'] > 0]
-                z_data, hover_template = display_df['Import Qty'], f'<b>%{{location}}</b><br>Import: %{{z:,.0f}} {unit}<extra></extra>'
-            else:
-                display_df = merged_df[(merged_df['Production Qty'] > 0) | (merged_df['Import Qty'] > 0)]
-                display_df['Combined'] = display_df['Production Qty'] + display_df['Import Qty']
-                z_data, hover_template, custom_data = display_df['Combined'], '<b>%{location}</b><br>Production: %{customdata[0]:,.0f}<br>Import: %{customdata[1]:,.0f}<extra></extra>', display_df[['Production Qty', 'Import Qty']].values
-            
-            locations = display_df['Country']
-            colorbar_title = f'Quantity {unit}'
-
-        if not locations.empty:
-            fig.add_trace(go.Choropleth(locations=locations, z=z_data, customdata=custom_data, locationmode="country names", colorscale="YlOrRd", colorbar_title=colorbar_title, hovertemplate=hover_template, name=''))
-        
-        fig.add_trace(go.Choropleth(locations=[home_country], z=[1], locationmode="country names", colorscale=[[0, home_country_color], [1, home_country_color]], showscale=False, hoverinfo='skip'))
-        fig.update_layout(geo=dict(showframe=False, showcoastlines=False, projection_type='natural earth', bgcolor='rgba(0,0,0,0)', landcolor='#E5ECF6'), margin=dict(t=10, b=10, l=10, r=10))
-        return fig
+            return no_update
+        # A cleared data-type dropdown falls back to the Combined view
+        data_type = data_type if data_type in ('Production', 'Import') else 'Combined'
+        return build_overview_fig(selected_year, selected_mineral, data_type)
+
+    # Indicator view of the Overview map, built in the browser from the indicator store
+    app.clientside_callback(
+        """
+        function(indicator, year, store) {
+            if (!indicator) {
+                return window.dash_clientside.no_update;
+            }
+            const table = store.tables[year];
+            const values = table.values[indicator];
+            const locations = [], countries = [], z = [];
+            for (let i = 0; i < values.length; i++) {
+                if (values[i] !== null) {
+                    locations.push(table.locations[i]);
+                    countries.push(table.countries[i]);
+                    z.push(values[i]);
+                }
+            }
+            const isHome = locations.map(code => code === store.home_iso3);
+            const data = [];
+            if (locations.length) {
+                data.push(Object.assign({}, store.trace, {
+                    locations: locations, z: z, text: countries,
+                    colorbar: {title: {text: indicator}},
+                    hovertemplate: '<b>%{text}</b><br>' + indicator + ': %{z:,.2f}<extra></extra>',
+                    marker: {line: {color: isHome.map(h => h ? store.home_color : '#444'), width: isHome.map(h => h ? 3 : 1)}}
+                }));
+            }
+            if (!isHome.includes(true)) {
+                data.push(store.home_trace);
+            }
+            return {data: data, layout: store.layout};
+        }
+        """,
+        Output('world-map', 'figure', allow_duplicate=True),
+        [Input('indicator-dropdown', 'value'),
+         Input('year-slider', 'value')],
+        [State('indicator-store', 'data')],
+        prevent_initial_call=True
+    )
 
     # Callback for the Analysis Tab
     @app.callback(
@@ -148,11 +264,11 @@ if 'df' in locals():
             return go.Figure().update_layout(title="Please select a mineral and run the analysis."), "Please make your selection and click 'Run Analysis'."
 
         # 1. Filter data for the selected year
-        year_df = df[df['Year'] == selected_year].copy()
+        year_df = df.iloc[year_slices[selected_year]]
 
         # 2. Get trade data (production and import) for the selected mineral
-        prod_df = year_df[year_df['Production Mineral'] == selected_mineral].groupby('Country')['Production Qty'].sum().reset_index()
-        import_df = year_df[year_df['Import Mineral Name'] == selected_mineral].groupby('Country')['Import Qty'].sum().reset_index()
+        prod_df = country_totals(PROD, (selected_year, selected_mineral)).reset_index()
+        import_df = country_totals(IMP, (selected_year, selected_mineral)).reset_index()
         trade_df = pd.merge(prod_df, import_df, on='Country', how='outer').fillna(0)
 
         # 3. Get indicator data for all countries
@@ -177,6 +293,8 @@ if 'df' in locals():
             return go.Figure().update_layout(title=f"No trade data available for {selected_mineral} in {selected_year}."), "No countries found with production or import data for the selected mineral."
 
         # 6. Normalize the factor columns (scale to 0-1 range)
+        # scikit-learn is imported here, on the first analysis run, to keep it out of app start-up
+        from sklearn.preprocessing import MinMaxScaler
         scaler = MinMaxScaler()
         analysis_df[factors] = scaler.fit_transform(analysis_df[factors])
 
@@ -189,13 +307,14 @@ if 'df' in locals():
 
         # Create the analysis map
         fig = go.Figure(go.Choropleth(
-            locations=analysis_df['Country'],
+            locations=analysis_df['Country'].map(COUNTRY_ISO3),
             z=analysis_df['Rank'],
-            locationmode='country names',
+            locationmode='ISO-3',
             colorscale='viridis_r',
             reversescale=True,
             colorbar_title='Rank',
-            hovertemplate='<b>%{location}</b><br>Rank: %{z}<br>Score: %{customdata[0]:.3f}<extra></extra>',
+            text=analysis_df['Country'],
+            hovertemplate='<b>%{text}</b><br>Rank: %{z}<br>Score: %{customdata[0]:.3f}<extra></extra>',
             customdata=analysis_df[['Score']].values
         ))
         fig.update_layout(title=f'Top Trading Partners for {selected_mineral} in {selected_year}', geo=dict(landcolor='#E5ECF6'), margin=dict(t=40, b=10, l=10, r=10))
@@ -0,0 +1,11 @@
+# --- One-time conversion of the raw CSV export into the Parquet file the dashboard loads ---
+# Re-run after replacing 'final 1.csv': python convert_data.py
+
+import pandas as pd
+
+df = pd.read_csv('final 1.csv', engine='pyarrow')
+
+# The trailing blank header cells are empty spreadsheet columns, not data
+df = df.loc[:, df.columns != '']
+
+df.to_parquet('mineral.parquet', engine='pyarrow', compression='zstd', index=False)
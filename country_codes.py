@@ -0,0 +1,114 @@
+"""ISO 3166-1 alpha-3 codes for the country names used in the data file."""
+
+# Keys are spelled exactly as in the data, including its non-standard and mis-encoded names
+COUNTRY_ISO3 = {
+    'Albania': 'ALB',
+    'Algeria': 'DZA',
+    'Argentina': 'ARG',
+    'Armenia': 'ARM',
+    'Australia': 'AUS',
+    'Austria': 'AUT',
+    'Azerbaijan': 'AZE',
+    'Belarus': 'BLR',
+    'Belgium': 'BEL',
+    'Bolivia (Plurinational State of)': 'BOL',
+    'Botswana': 'BWA',
+    'Brazil': 'BRA',
+    'Bulgaria': 'BGR',
+    'Burundi': 'BDI',
+    'Canada': 'CAN',
+    'Chile': 'CHL',
+    'China': 'CHN',
+    'Colombia': 'COL',
+    'Congo, D.R.': 'COD',
+    'Congo, Rep.': 'COG',
+    'Cuba': 'CUB',
+    'Cyprus': 'CYP',
+    "CÃ´te d'Ivoire": 'CIV',
+    'Dominican Republic': 'DOM',
+    'Ecuador': 'ECU',
+    'Egypt, Arab Rep.': 'EGY',
+    'Eritrea': 'ERI',
+    'Estonia': 'EST',
+    'Ethiopia': 'ETH',
+    'Finland': 'FIN',
+    'France': 'FRA',
+    'Georgia': 'GEO',
+    'Germany': 'DEU',
+    'Greece': 'GRC',
+    'Guatemala': 'GTM',
+    'Honduras': 'HND',
+    'Hong Kong SAR, China': 'HKG',
+    'India': 'IND',
+    'Indonesia': 'IDN',
+    'Iran, Islamic Rep.': 'IRN',
+    'Iraq': 'IRQ',
+    'Israel': 'ISR',
+    'Japan': 'JPN',
+    'Jordan': 'JOR',
+    'Kazakhstan': 'KAZ',
+    'Kenya': 'KEN',
+    "Korea, Dem. People's Rep.": 'PRK',
+    'Korea, Rep.': 'KOR',
+    'Kosovo': 'XKX',
+    'Kyrgyzstan': 'KGZ',
+    'Lao PDR': 'LAO',
+    'Madagascar': 'MDG',
+    'Malawi': 'MWI',
+    'Malaysia': 'MYS',
+    'Mauritania': 'MRT',
+    'Mexico': 'MEX',
+    'Mongolia': 'MNG',
+    'Morocco': 'MAR',
+    'Mozambique': 'MOZ',
+    'Myanmar': 'MMR',
+    'Namibia': 'NAM',
+    'Nauru': 'NRU',
+    'Netherland': 'NLD',
+    'New Caledonia': 'NCL',
+    'Nigeria': 'NGA',
+    'North Macedonia': 'MKD',
+    'Norway': 'NOR',
+    'Oman': 'OMN',
+    'Pakistan': 'PAK',
+    'Panama': 'PAN',
+    'Papua New Guinea': 'PNG',
+    'Peru': 'PER',
+    'Philippines': 'PHL',
+    'Poland': 'POL',
+    'Portugal': 'PRT',
+    'Romania': 'ROU',
+    'Russian Federation': 'RUS',
+    'Rwanda': 'RWA',
+    'Saudi Arabia': 'SAU',
+    'Senegal': 'SEN',
+    'Serbia': 'SRB',
+    'Sierra Leone': 'SLE',
+    'Singapore': 'SGP',
+    'Slovak Republic': 'SVK',
+    'Solomon Islands': 'SLB',
+    'South Africa': 'ZAF',
+    'Spain': 'ESP',
+    'Sri Lanka': 'LKA',
+    'Sweden': 'SWE',
+    'Syrian Arab Republic': 'SYR',
+    'Taiwan': 'TWN',
+    'Tajikistan': 'TJK',
+    'Tanzania': 'TZA',
+    'Tanzania Rep': 'TZA',
+    'Thailand': 'THA',
+    'Togo': 'TGO',
+    'Tunisia': 'TUN',
+    'Turkey': 'TUR',
+    'Turkmenistan': 'TKM',
+    'U Arab Emts': 'ARE',
+    'Uganda': 'UGA',
+    'Ukraine': 'UKR',
+    'United Kingdom': 'GBR',
+    'United States': 'USA',
+    'Uzbekistan': 'UZB',
+    'Venezuela, RB': 'VEN',
+    'Vietnam': 'VNM',
+    'Zambia': 'ZMB',
+    'Zimbabwe': 'ZWE',
+}